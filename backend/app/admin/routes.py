@@ -1,6 +1,9 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List, Optional
+import asyncio
+from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Optional, Tuple
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
 import secrets
 import string
@@ -10,9 +13,10 @@ from ..common.models import (
     User, UserCreate, UserRole, UserUpdate, LoanApplication, LoanStatus
 )
 from ..common.auth import get_current_active_user, get_password_hash
-from ..common.database import get_database
+from ..common.database import get_database, email_index_ready
+from ..common.date_utils import month_start, next_month_start
 from ..common.file_utils import save_profile_image, delete_profile_image
-from ..common.serializers import serialize_user_document, serialize_document_list, serialize_objectid
+from ..common.serializers import serialize_user_document, serialize_document_list, serialize_objectid, json_response
 from ..common.email_service import email_service
 
 class CreateManagerRequest(BaseModel):
@@ -32,56 +36,85 @@ def require_admin(current_user: User = Depends(get_current_active_user)):
         )
     return current_user
 
+async def _managed_user_ids(db, admin_id: ObjectId) -> Tuple[List[ObjectId], List[ObjectId]]:
+    """Return the ids of an admin's managers and of all operators under those managers"""
+    manager_ids = await db.users.distinct("_id", {
+        "role": UserRole.MANAGER,
+        "created_by": admin_id
+    })
+    operator_ids = await db.users.distinct("_id", {
+        "role": UserRole.OPERATOR,
+        "created_by": {"$in": manager_ids}
+    }) if manager_ids else []
+    return manager_ids, operator_ids
+
+async def _application_stats(db, operator_ids: List[ObjectId]) -> dict:
+    """Count applications and sum loan amounts per status in a single aggregation"""
+    stats = {}
+    async for doc in db.loan_applications.aggregate([
+        {"$match": {"operator_id": {"$in": operator_ids}}},
+        {"$group": {"_id": "$status", "count": {"$sum": 1}, "loan_amount": {"$sum": "$loan_amount"}}}
+    ]):
+        stats[doc["_id"]] = doc
+    return stats
+
+def _status_count(stats: dict, loan_status: LoanStatus) -> int:
+    return stats.get(loan_status.value, {}).get("count", 0)
+
 @router.post("/managers", response_model=dict)
 async def create_manager(
     request: CreateManagerRequest,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(require_admin)
 ):
-    db = await get_database()
+    db = get_database()
     
-    # Check if email already exists
-    existing = await db.users.find_one({"email": request.email})
-    if existing:
+    # Without a confirmed unique email index (startup could not create it) fall back to a pre-check
+    if not email_index_ready() and await db.users.find_one({"email": request.email}, {"_id": 1}):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User with this email already exists"
         )
     
     # Create manager data
+    now = datetime.utcnow()
     user_dict = {
         "name": request.name,
         "email": request.email,
         "phone": request.phone,
         "role": UserRole.MANAGER,
         "is_active": True,  # Active by default
-        "created_by": ObjectId(current_user.id),
-        "password_hash": get_password_hash(request.password),
+        "created_by": current_user.id,
+        "password_hash": await run_in_threadpool(get_password_hash, request.password),
         "first_login": False,
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow()
+        "created_at": now,
+        "updated_at": now
     }
     
     # Add profile image as base64 if provided
     if request.profile_image_base64:
         user_dict["profile_image_base64"] = request.profile_image_base64
     
-    # Insert user first to get ID
-    result = await db.users.insert_one(user_dict)
-    user_id = str(result.inserted_id)
-    
-    # Send email notification
+    # Insert user first to get ID; the unique email index rejects duplicates atomically
     try:
-        await email_service.send_user_creation_notification(
-            user_email=request.email,
-            user_name=request.name,
-            user_role="manager",
-            temporary_password=request.password,
-            created_by_name=current_user.name
+        result = await db.users.insert_one(user_dict)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User with this email already exists"
         )
-    except Exception as e:
-        print(f"Failed to send email notification: {str(e)}")
-        # Don't fail the user creation if email fails
+    user_id = str(result.inserted_id)
     
+    # Send email notification after the response goes out; SMTP can take seconds
+    # and send_user_creation_notification logs its own failures
+    background_tasks.add_task(
+        email_service.send_user_creation_notification,
+        user_email=request.email,
+        user_name=request.name,
+        user_role="manager",
+        temporary_password=request.password,
+        created_by_name=current_user.name
+    )
     
     return {
         "id": user_id,
@@ -89,32 +122,30 @@ async def create_manager(
         "message": "Manager created successfully and is now active. Email notification sent."
     }
 
-@router.get("/managers", response_model=List[dict])
+@router.get("/managers", response_model=None)
 async def get_managers(
     current_user: User = Depends(require_admin)
 ):
-    db = await get_database()
-    managers = []
+    db = get_database()
     
-    async for user in db.users.find({
+    managers = await db.users.find({
         "role": UserRole.MANAGER,
-        "created_by": ObjectId(current_user.id)
-    }):
-        managers.append(serialize_user_document(user))
+        "created_by": current_user.id
+    }).to_list(length=None)
     
-    return managers
+    return json_response(managers)
 
 @router.get("/managers/{manager_id}", response_model=dict)
 async def get_manager(
     manager_id: str,
     current_user: User = Depends(require_admin)
 ):
-    db = await get_database()
+    db = get_database()
     
     manager = await db.users.find_one({
         "_id": ObjectId(manager_id),
         "role": UserRole.MANAGER,
-        "created_by": ObjectId(current_user.id)
+        "created_by": current_user.id
     })
     
     if not manager:
@@ -131,29 +162,27 @@ async def update_manager(
     manager_update: UserUpdate,
     current_user: User = Depends(require_admin)
 ):
-    db = await get_database()
+    db = get_database()
     
-    # Verify the manager exists and belongs to this admin
-    existing = await db.users.find_one({
-        "_id": ObjectId(manager_id),
-        "role": UserRole.MANAGER,
-        "created_by": ObjectId(current_user.id)
-    })
+    update_data = manager_update.model_dump(exclude_unset=True, exclude_none=True)
+    update_data["updated_at"] = datetime.utcnow()
     
-    if not existing:
+    # The ownership filter doubles as the existence check, so no read precedes the write
+    result = await db.users.update_one(
+        {
+            "_id": ObjectId(manager_id),
+            "role": UserRole.MANAGER,
+            "created_by": current_user.id
+        },
+        {"$set": update_data}
+    )
+    
+    if result.matched_count == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Manager not found"
         )
     
-    update_data = {k: v for k, v in manager_update.model_dump().items() if v is not None}
-    update_data["updated_at"] = datetime.utcnow()
-    
-    await db.users.update_one(
-        {"_id": ObjectId(manager_id)},
-        {"$set": update_data}
-    )
-    
     return {"message": "Manager updated successfully"}
 
 @router.delete("/managers/{manager_id}", response_model=dict)
@@ -161,38 +190,35 @@ async def delete_manager(
     manager_id: str,
     current_user: User = Depends(require_admin)
 ):
-    db = await get_database()
+    db = get_database()
     
-    # Verify the manager exists and belongs to this admin
-    existing = await db.users.find_one({
+    result = await db.users.delete_one({
         "_id": ObjectId(manager_id),
         "role": UserRole.MANAGER,
-        "created_by": ObjectId(current_user.id)
+        "created_by": current_user.id
     })
     
-    if not existing:
+    if result.deleted_count == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Manager not found"
         )
     
-    await db.users.delete_one({"_id": ObjectId(manager_id)})
-    
     return {"message": "Manager deleted successfully"}
 
-@router.get("/managers/{manager_id}/operators", response_model=List[dict])
+@router.get("/managers/{manager_id}/operators", response_model=None)
 async def get_manager_operators(
     manager_id: str,
     current_user: User = Depends(require_admin)
 ):
-    db = await get_database()
+    db = get_database()
     
     # Verify the manager exists and belongs to this admin
     manager = await db.users.find_one({
         "_id": ObjectId(manager_id),
         "role": UserRole.MANAGER,
-        "created_by": ObjectId(current_user.id)
-    })
+        "created_by": current_user.id
+    }, {"_id": 1})
     
     if not manager:
         raise HTTPException(
@@ -200,28 +226,26 @@ async def get_manager_operators(
             detail="Manager not found"
         )
     
-    operators = []
-    async for user in db.users.find({
+    operators = await db.users.find({
         "role": UserRole.OPERATOR,
         "created_by": ObjectId(manager_id)
-    }):
-        operators.append(serialize_user_document(user))
+    }).to_list(length=None)
     
-    return operators
+    return json_response(operators)
 
 @router.get("/managers/{manager_id}/stats", response_model=dict)
 async def get_manager_stats(
     manager_id: str,
     current_user: User = Depends(require_admin)
 ):
-    db = await get_database()
+    db = get_database()
     
     # Verify the manager exists and belongs to this admin
     manager = await db.users.find_one({
         "_id": ObjectId(manager_id),
         "role": UserRole.MANAGER,
-        "created_by": ObjectId(current_user.id)
-    })
+        "created_by": current_user.id
+    }, {"name": 1})
     
     if not manager:
         raise HTTPException(
@@ -229,19 +253,11 @@ async def get_manager_stats(
             detail="Manager not found"
         )
     
-    # Get operator count for this manager
-    operator_count = await db.users.count_documents({
-        "role": UserRole.OPERATOR,
-        "created_by": ObjectId(manager_id)
-    })
-    
     # Get all operator IDs for this manager
-    operator_ids = []
-    async for operator in db.users.find({
+    operator_ids = await db.users.distinct("_id", {
         "role": UserRole.OPERATOR,
         "created_by": ObjectId(manager_id)
-    }):
-        operator_ids.append(operator["_id"])
+    })
     
     if not operator_ids:
         return {
@@ -254,65 +270,29 @@ async def get_manager_stats(
             "rejected_applications": 0
         }
     
-    # Get application statistics
-    total_apps = await db.loan_applications.count_documents({"operator_id": {"$in": operator_ids}})
-    pending_apps = await db.loan_applications.count_documents({
-        "operator_id": {"$in": operator_ids},
-        "status": LoanStatus.PENDING
-    })
-    verified_apps = await db.loan_applications.count_documents({
-        "operator_id": {"$in": operator_ids},
-        "status": LoanStatus.VERIFIED
-    })
-    approved_apps = await db.loan_applications.count_documents({
-        "operator_id": {"$in": operator_ids},
-        "status": LoanStatus.APPROVED
-    })
-    rejected_apps = await db.loan_applications.count_documents({
-        "operator_id": {"$in": operator_ids},
-        "status": LoanStatus.REJECTED
-    })
+    # Get application statistics grouped by status in one round-trip
+    stats = await _application_stats(db, operator_ids)
     
     return {
         "manager_name": manager["name"],
-        "operators_count": operator_count,
-        "total_applications": total_apps,
-        "pending_applications": pending_apps,
-        "verified_applications": verified_apps,
-        "approved_applications": approved_apps,
-        "rejected_applications": rejected_apps
+        "operators_count": len(operator_ids),
+        "total_applications": sum(doc["count"] for doc in stats.values()),
+        "pending_applications": _status_count(stats, LoanStatus.PENDING),
+        "verified_applications": _status_count(stats, LoanStatus.VERIFIED),
+        "approved_applications": _status_count(stats, LoanStatus.APPROVED),
+        "rejected_applications": _status_count(stats, LoanStatus.REJECTED)
     }
 
 @router.get("/dashboard/overview", response_model=dict)
 async def get_admin_dashboard(
     current_user: User = Depends(require_admin)
 ):
-    db = await get_database()
+    db = get_database()
     
-    # Get manager count
-    manager_count = await db.users.count_documents({
-        "role": UserRole.MANAGER,
-        "created_by": ObjectId(current_user.id)
-    })
-    
-    # Get all managers for this admin
-    manager_ids = []
-    async for manager in db.users.find({
-        "role": UserRole.MANAGER,
-        "created_by": ObjectId(current_user.id)
-    }):
-        manager_ids.append(manager["_id"])
-    
-    # Get total operators under all managers
-    total_operators = 0
-    all_operator_ids = []
-    if manager_ids:
-        async for operator in db.users.find({
-            "role": UserRole.OPERATOR,
-            "created_by": {"$in": manager_ids}
-        }):
-            all_operator_ids.append(operator["_id"])
-        total_operators = len(all_operator_ids)
+    # Get all managers for this admin and the operators under them
+    manager_ids, all_operator_ids = await _managed_user_ids(db, current_user.id)
+    manager_count = len(manager_ids)
+    total_operators = len(all_operator_ids)
     
     # Get application statistics across all operators
     if not all_operator_ids:
@@ -327,41 +307,18 @@ async def get_admin_dashboard(
             "total_loan_amount": 0
         }
     
-    total_apps = await db.loan_applications.count_documents({"operator_id": {"$in": all_operator_ids}})
-    pending_apps = await db.loan_applications.count_documents({
-        "operator_id": {"$in": all_operator_ids},
-        "status": LoanStatus.PENDING
-    })
-    verified_apps = await db.loan_applications.count_documents({
-        "operator_id": {"$in": all_operator_ids},
-        "status": LoanStatus.VERIFIED
-    })
-    approved_apps = await db.loan_applications.count_documents({
-        "operator_id": {"$in": all_operator_ids},
-        "status": LoanStatus.APPROVED
-    })
-    rejected_apps = await db.loan_applications.count_documents({
-        "operator_id": {"$in": all_operator_ids},
-        "status": LoanStatus.REJECTED
-    })
-    
-    # Calculate total loan amount for approved applications
-    total_loan_amount = 0
-    async for app in db.loan_applications.find({
-        "operator_id": {"$in": all_operator_ids},
-        "status": LoanStatus.APPROVED
-    }):
-        total_loan_amount += app.get("loan_amount", 0)
+    # Counts and the approved loan total come from one grouped aggregation
+    stats = await _application_stats(db, all_operator_ids)
     
     return {
         "managers_count": manager_count,
         "total_operators": total_operators,
-        "total_applications": total_apps,
-        "pending_applications": pending_apps,
-        "verified_applications": verified_apps,
-        "approved_applications": approved_apps,
-        "rejected_applications": rejected_apps,
-        "total_loan_amount": total_loan_amount
+        "total_applications": sum(doc["count"] for doc in stats.values()),
+        "pending_applications": _status_count(stats, LoanStatus.PENDING),
+        "verified_applications": _status_count(stats, LoanStatus.VERIFIED),
+        "approved_applications": _status_count(stats, LoanStatus.APPROVED),
+        "rejected_applications": _status_count(stats, LoanStatus.REJECTED),
+        "total_loan_amount": stats.get(LoanStatus.APPROVED.value, {}).get("loan_amount", 0)
     }
 
 @router.get("/analytics/stats", response_model=dict)
@@ -369,132 +326,88 @@ async def get_system_stats(
     current_user: User = Depends(require_admin)
 ):
     """Get comprehensive system statistics"""
-    db = await get_database()
-    
-    # Get all managers created by this admin
-    managers = []
-    async for manager in db.users.find({
-        "role": UserRole.MANAGER,
-        "created_by": ObjectId(current_user.id)
-    }):
-        managers.append(manager)
+    db = get_database()
     
-    # Get all operators created by managers under this admin
-    all_operator_ids = []
-    for manager in managers:
-        async for operator in db.users.find({
-            "role": UserRole.OPERATOR,
-            "created_by": ObjectId(manager["_id"])
-        }):
-            all_operator_ids.append(ObjectId(operator["_id"]))
+    # Get all managers created by this admin and the operators under them
+    manager_ids, all_operator_ids = await _managed_user_ids(db, current_user.id)
     
     # Count statistics
-    total_managers = len(managers)
+    total_managers = len(manager_ids)
     total_operators = len(all_operator_ids)
     
-    total_applications = await db.loan_applications.count_documents({
-        "operator_id": {"$in": all_operator_ids}
-    })
-    
-    pending_applications = await db.loan_applications.count_documents({
-        "operator_id": {"$in": all_operator_ids},
-        "status": LoanStatus.VERIFIED
-    })
-    
-    verification_pending = await db.loan_applications.count_documents({
-        "operator_id": {"$in": all_operator_ids},
-        "status": LoanStatus.PENDING
-    })
-    
-    approved_applications = await db.loan_applications.count_documents({
-        "operator_id": {"$in": all_operator_ids},
-        "status": LoanStatus.APPROVED
-    })
-    
-    rejected_applications = await db.loan_applications.count_documents({
-        "operator_id": {"$in": all_operator_ids},
-        "status": LoanStatus.REJECTED
-    })
-    
-    # Calculate total loan value
-    total_loan_value = 0
-    async for app in db.loan_applications.find({
-        "operator_id": {"$in": all_operator_ids},
-        "status": LoanStatus.APPROVED
-    }):
-        total_loan_value += app.get("loan_amount", 0)
+    # Per-status counts and the approved loan value in one grouped aggregation
+    stats = await _application_stats(db, all_operator_ids)
     
     return {
         "total_managers": total_managers,
         "total_operators": total_operators,
-        "total_applications": total_applications,
-        "total_loan_value": total_loan_value,
-        "pending_applications": pending_applications,
-        "approved_applications": approved_applications,
-        "rejected_applications": rejected_applications,
-        "verification_pending": verification_pending
+        "total_applications": sum(doc["count"] for doc in stats.values()),
+        "total_loan_value": stats.get(LoanStatus.APPROVED.value, {}).get("loan_amount", 0),
+        # Verified applications are the ones pending a manager decision
+        "pending_applications": _status_count(stats, LoanStatus.VERIFIED),
+        "approved_applications": _status_count(stats, LoanStatus.APPROVED),
+        "rejected_applications": _status_count(stats, LoanStatus.REJECTED),
+        "verification_pending": _status_count(stats, LoanStatus.PENDING)
     }
 
-@router.get("/analytics/activity", response_model=List[dict])
+@router.get("/analytics/activity", response_model=None)
 async def get_recent_activity(
     current_user: User = Depends(require_admin),
     limit: int = 20
 ):
     """Get recent system activity"""
-    db = await get_database()
+    db = get_database()
     
     # Get all managers and operators under this admin
-    managers = []
-    async for manager in db.users.find({
-        "role": UserRole.MANAGER,
-        "created_by": ObjectId(current_user.id)
-    }):
-        managers.append(manager)
-    
-    all_user_ids = [ObjectId(current_user.id)]
-    for manager in managers:
-        all_user_ids.append(ObjectId(manager["_id"]))
-        async for operator in db.users.find({
-            "role": UserRole.OPERATOR,
-            "created_by": ObjectId(manager["_id"])
-        }):
-            all_user_ids.append(ObjectId(operator["_id"]))
+    manager_ids, operator_ids = await _managed_user_ids(db, current_user.id)
+    all_user_ids = [current_user.id] + manager_ids + operator_ids
+    
+    recent_apps = await db.loan_applications.find(
+        {"operator_id": {"$in": all_user_ids}},
+        {"operator_id": 1, "animal_type": 1, "created_at": 1}
+    ).sort("created_at", -1).limit(limit).to_list(length=None)
+    
+    recent_users = await db.users.find(
+        {"created_by": {"$in": all_user_ids}},
+        {"created_by": 1, "role": 1, "name": 1, "created_at": 1}
+    ).sort("created_at", -1).limit(10).to_list(length=None)
+    
+    # Resolve every operator/creator name in one query instead of one per row
+    actor_ids = {app["operator_id"] for app in recent_apps} | {user["created_by"] for user in recent_users}
+    names = {
+        doc["_id"]: doc.get("name")
+        for doc in await db.users.find({"_id": {"$in": list(actor_ids)}}, {"name": 1}).to_list(length=None)
+    }
     
     # Get recent loan applications
     recent_activities = []
-    async for app in db.loan_applications.find({
-        "operator_id": {"$in": all_user_ids}
-    }).sort("created_at", -1).limit(limit):
-        operator = await db.users.find_one({"_id": app["operator_id"]})
+    for app in recent_apps:
         activity = {
             "id": str(app["_id"]),
             "type": "loan_application",
             "description": f"New loan application submitted for {app.get('animal_type', 'livestock')}",
             "timestamp": app.get("created_at", datetime.now()).isoformat(),
-            "user_name": operator.get("name", "Unknown") if operator else "Unknown"
+            "user_name": names.get(app["operator_id"]) or "Unknown"
         }
         recent_activities.append(activity)
     
     # Get recent user creations
-    async for user in db.users.find({
-        "created_by": {"$in": all_user_ids}
-    }).sort("created_at", -1).limit(10):
-        creator = await db.users.find_one({"_id": user["created_by"]})
+    for user in recent_users:
         activity = {
             "id": str(user["_id"]),
             "type": "user_creation",
             "description": f"New {user['role'].lower()} created: {user['name']}",
             "timestamp": user.get("created_at", datetime.now()).isoformat(),
-            "user_name": creator.get("name", "System") if creator else "System"
+            "user_name": names.get(user["created_by"]) or "System"
         }
         recent_activities.append(activity)
     
     # Sort all activities by timestamp
     recent_activities.sort(key=lambda x: x["timestamp"], reverse=True)
     
-    return recent_activities[:limit]
+    return json_response(recent_activities[:limit])
 
-@router.get("/reports/loan-applications", response_model=List[dict])
+@router.get("/reports/loan-applications", response_model=None)
 async def get_loan_applications_report(
     current_user: User = Depends(require_admin),
     start_date: Optional[str] = None,
@@ -503,23 +416,10 @@ async def get_loan_applications_report(
     animal_type: Optional[str] = None
 ):
     """Generate loan applications report with filtering"""
-    db = await get_database()
+    db = get_database()
     
     # Get all operators under this admin
-    managers = []
-    async for manager in db.users.find({
-        "role": UserRole.MANAGER,
-        "created_by": ObjectId(current_user.id)
-    }):
-        managers.append(manager)
-    
-    all_operator_ids = []
-    for manager in managers:
-        async for operator in db.users.find({
-            "role": UserRole.OPERATOR,
-            "created_by": ObjectId(manager["_id"])
-        }):
-            all_operator_ids.append(ObjectId(operator["_id"]))
+    _, all_operator_ids = await _managed_user_ids(db, current_user.id)
     
     # Build query filter
     query_filter = {"operator_id": {"$in": all_operator_ids}}
@@ -542,16 +442,25 @@ async def get_loan_applications_report(
         query_filter["animal_type"] = animal_type
     
     # Fetch loan applications
+    applications = await db.loan_applications.find(query_filter).sort("created_at", -1).to_list(length=None)
+    
+    # Fetch the referenced applicants, animals and operators with one query per collection
+    async def fetch_by_ids(collection, field, projection):
+        ids = list({app[field] for app in applications if app.get(field)})
+        if not ids:
+            return {}
+        docs = await collection.find({"_id": {"$in": ids}}, projection).to_list(length=None)
+        return {doc["_id"]: doc for doc in docs}
+    
+    applicants = await fetch_by_ids(db.applicants, "applicant_id", {"name": 1, "phone": 1, "email": 1})
+    animals = await fetch_by_ids(db.animals, "animal_id", {"type": 1, "breed": 1, "age": 1})
+    operators = await fetch_by_ids(db.users, "operator_id", {"name": 1})
+    
     applications_report = []
-    async for app in db.loan_applications.find(query_filter).sort("created_at", -1):
-        # Get applicant details
-        applicant = await db.applicants.find_one({"_id": app["applicant_id"]})
-        
-        # Get animal details
-        animal = await db.animals.find_one({"_id": app["animal_id"]})
-        
-        # Get operator details
-        operator = await db.users.find_one({"_id": app["operator_id"]})
+    for app in applications:
+        applicant = applicants.get(app.get("applicant_id"))
+        animal = animals.get(app.get("animal_id"))
+        operator = operators.get(app.get("operator_id"))
         
         report_entry = {
             "id": str(app["_id"]),
@@ -573,67 +482,60 @@ async def get_loan_applications_report(
         }
         applications_report.append(report_entry)
     
-    return applications_report
+    return json_response(applications_report)
 
-@router.get("/reports/managers-performance", response_model=List[dict])
+@router.get("/reports/managers-performance", response_model=None)
 async def get_managers_performance_report(
     current_user: User = Depends(require_admin)
 ):
     """Generate managers performance report"""
-    db = await get_database()
+    db = get_database()
     
     performance_report = []
     
-    async for manager in db.users.find({
+    managers = await db.users.find({
         "role": UserRole.MANAGER,
-        "created_by": ObjectId(current_user.id)
-    }):
-        # Count operators under this manager
-        operators_count = await db.users.count_documents({
-            "role": UserRole.OPERATOR,
-            "created_by": ObjectId(manager["_id"])
-        })
-        
-        # Get all operator IDs under this manager
-        operator_ids = []
-        async for operator in db.users.find({
-            "role": UserRole.OPERATOR,
-            "created_by": ObjectId(manager["_id"])
-        }):
-            operator_ids.append(ObjectId(operator["_id"]))
-        
-        # Count loan applications handled
-        total_applications = await db.loan_applications.count_documents({
-            "operator_id": {"$in": operator_ids}
-        })
-        
-        approved_applications = await db.loan_applications.count_documents({
-            "operator_id": {"$in": operator_ids},
-            "status": LoanStatus.APPROVED
-        })
-        
-        rejected_applications = await db.loan_applications.count_documents({
-            "operator_id": {"$in": operator_ids},
-            "status": LoanStatus.REJECTED
-        })
-        
-        pending_applications = await db.loan_applications.count_documents({
-            "operator_id": {"$in": operator_ids},
-            "status": LoanStatus.PENDING
-        })
-        
-        verified_applications = await db.loan_applications.count_documents({
-            "operator_id": {"$in": operator_ids},
-            "status": LoanStatus.VERIFIED
-        })
+        "created_by": current_user.id
+    }, {"name": 1, "email": 1, "created_at": 1, "last_login": 1}).to_list(length=None)
+    
+    manager_ids = [manager["_id"] for manager in managers]
+    
+    # Operator counts and per-status application totals for every manager at once,
+    # grouped on created_by / the denormalized manager_id instead of queried per manager
+    operator_counts = {}
+    stats_by_manager = {}
+    if manager_ids:
+        operator_groups, status_groups = await asyncio.gather(
+            db.users.aggregate([
+                {"$match": {"role": UserRole.OPERATOR, "created_by": {"$in": manager_ids}}},
+                {"$group": {"_id": "$created_by", "count": {"$sum": 1}}}
+            ]).to_list(length=None),
+            db.loan_applications.aggregate([
+                {"$match": {"manager_id": {"$in": manager_ids}}},
+                {
+                    "$group": {
+                        "_id": {"manager_id": "$manager_id", "status": "$status"},
+                        "count": {"$sum": 1},
+                        "loan_amount": {"$sum": "$loan_amount"}
+                    }
+                }
+            ]).to_list(length=None)
+        )
+        operator_counts = {doc["_id"]: doc["count"] for doc in operator_groups}
+        for doc in status_groups:
+            stats_by_manager.setdefault(doc["_id"]["manager_id"], {})[doc["_id"]["status"]] = doc
+    
+    for manager in managers:
+        operators_count = operator_counts.get(manager["_id"], 0)
         
-        # Calculate total approved loan amount
-        total_approved_amount = 0
-        async for app in db.loan_applications.find({
-            "operator_id": {"$in": operator_ids},
-            "status": LoanStatus.APPROVED
-        }):
-            total_approved_amount += app.get("loan_amount", 0)
+        # Count loan applications handled, per status, with the approved amount
+        stats = stats_by_manager.get(manager["_id"], {})
+        total_applications = sum(doc["count"] for doc in stats.values())
+        approved_applications = _status_count(stats, LoanStatus.APPROVED)
+        rejected_applications = _status_count(stats, LoanStatus.REJECTED)
+        pending_applications = _status_count(stats, LoanStatus.PENDING)
+        verified_applications = _status_count(stats, LoanStatus.VERIFIED)
+        total_approved_amount = stats.get(LoanStatus.APPROVED.value, {}).get("loan_amount", 0)
         
         approval_rate = (approved_applications / total_applications * 100) if total_applications > 0 else 0
         
@@ -654,7 +556,7 @@ async def get_managers_performance_report(
         }
         performance_report.append(performance_entry)
     
-    return performance_report
+    return json_response(performance_report)
 
 @router.get("/reports/financial-summary", response_model=dict)
 async def get_financial_summary_report(
@@ -663,23 +565,10 @@ async def get_financial_summary_report(
     end_date: Optional[str] = None
 ):
     """Generate financial summary report"""
-    db = await get_database()
+    db = get_database()
     
     # Get all operators under this admin
-    managers = []
-    async for manager in db.users.find({
-        "role": UserRole.MANAGER,
-        "created_by": ObjectId(current_user.id)
-    }):
-        managers.append(manager)
-    
-    all_operator_ids = []
-    for manager in managers:
-        async for operator in db.users.find({
-            "role": UserRole.OPERATOR,
-            "created_by": ObjectId(manager["_id"])
-        }):
-            all_operator_ids.append(ObjectId(operator["_id"]))
+    _, all_operator_ids = await _managed_user_ids(db, current_user.id)
     
     # Build query filter
     query_filter = {"operator_id": {"$in": all_operator_ids}}
@@ -695,20 +584,63 @@ async def get_financial_summary_report(
         else:
             query_filter["created_at"] = {"$lte": end_datetime}
     
-    # Calculate financial metrics
-    total_loan_requests = await db.loan_applications.count_documents(query_filter)
+    # Last 12 calendar months, independent of the requested period as before
+    now = datetime.utcnow()
+    first_month = month_start(now, 11)
+    approved = LoanStatus.APPROVED.value
+    approved_amount = {"$cond": [{"$eq": ["$status", approved]}, "$loan_amount", 0]}
+    approved_count = {"$cond": [{"$eq": ["$status", approved]}, 1, 0]}
+    period_filter = {k: v for k, v in query_filter.items() if k != "operator_id"}
+    
+    # Calculate all financial metrics in one aggregation over this admin's applications
+    facets = await db.loan_applications.aggregate([
+        {"$match": {"operator_id": query_filter["operator_id"]}},
+        {
+            "$facet": {
+                "totals": [
+                    {"$match": period_filter},
+                    {
+                        "$group": {
+                            "_id": None,
+                            "requests": {"$sum": 1},
+                            "requested_amount": {"$sum": "$loan_amount"},
+                            "approved": {"$sum": approved_count},
+                            "approved_amount": {"$sum": approved_amount}
+                        }
+                    }
+                ],
+                "animals": [
+                    {"$match": {**period_filter, "status": approved, "animal_type": {"$in": ["cow", "goat", "hen"]}}},
+                    {"$group": {"_id": "$animal_type", "count": {"$sum": 1}, "total_amount": {"$sum": "$loan_amount"}}}
+                ],
+                "monthly": [
+                    {"$match": {"created_at": {"$gte": first_month, "$lt": next_month_start(now)}}},
+                    {
+                        "$group": {
+                            "_id": {"$dateTrunc": {"date": "$created_at", "unit": "month"}},
+                            "applications": {"$sum": 1},
+                            "approved": {"$sum": approved_count},
+                            "amount": {"$sum": approved_amount}
+                        }
+                    }
+                ]
+            }
+        }
+    ]).to_list(length=None)
+    facets = facets[0]
     
-    approved_query = {**query_filter, "status": LoanStatus.APPROVED}
-    total_approved_loans = await db.loan_applications.count_documents(approved_query)
+    totals = facets["totals"][0] if facets["totals"] else {}
+    total_loan_requests = totals.get("requests", 0)
+    total_approved_loans = totals.get("approved", 0)
+    total_requested_amount = totals.get("requested_amount", 0)
+    total_approved_amount = totals.get("approved_amount", 0)
     
     # Calculate amounts by animal type
+    animals = {doc["_id"]: doc for doc in facets["animals"]}
     animal_wise_summary = {}
     for animal_type in ["cow", "goat", "hen"]:
-        animal_query = {**approved_query, "animal_type": animal_type}
-        animal_count = await db.loan_applications.count_documents(animal_query)
-        animal_amount = 0
-        async for app in db.loan_applications.find(animal_query):
-            animal_amount += app.get("loan_amount", 0)
+        animal_count = animals.get(animal_type, {}).get("count", 0)
+        animal_amount = animals.get(animal_type, {}).get("total_amount", 0)
         
         animal_wise_summary[animal_type] = {
             "count": animal_count,
@@ -716,40 +648,17 @@ async def get_financial_summary_report(
             "average_amount": animal_amount / animal_count if animal_count > 0 else 0
         }
     
-    # Calculate total amounts
-    total_approved_amount = 0
-    total_requested_amount = 0
-    
-    async for app in db.loan_applications.find(approved_query):
-        total_approved_amount += app.get("loan_amount", 0)
-    
-    async for app in db.loan_applications.find(query_filter):
-        total_requested_amount += app.get("loan_amount", 0)
-    
-    # Calculate monthly breakdown (last 12 months)
+    # Calculate monthly breakdown (last 12 months), filling months without applications
+    months = {doc["_id"]: doc for doc in facets["monthly"]}
     monthly_breakdown = []
     for i in range(11, -1, -1):
-        month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        month_start = month_start.replace(month=month_start.month - i if month_start.month > i else 12 + month_start.month - i)
-        month_end = month_start.replace(month=month_start.month + 1) if month_start.month < 12 else month_start.replace(year=month_start.year + 1, month=1)
-        
-        month_query = {
-            **query_filter,
-            "created_at": {"$gte": month_start, "$lt": month_end}
-        }
-        
-        month_applications = await db.loan_applications.count_documents(month_query)
-        month_approved = await db.loan_applications.count_documents({**month_query, "status": LoanStatus.APPROVED})
-        
-        month_amount = 0
-        async for app in db.loan_applications.find({**month_query, "status": LoanStatus.APPROVED}):
-            month_amount += app.get("loan_amount", 0)
-        
+        bucket = month_start(now, i)
+        month = months.get(bucket, {})
         monthly_breakdown.append({
-            "month": month_start.strftime("%B %Y"),
-            "applications": month_applications,
-            "approved": month_approved,
-            "amount": month_amount
+            "month": bucket.strftime("%B %Y"),
+            "applications": month.get("applications", 0),
+            "approved": month.get("approved", 0),
+            "amount": month.get("amount", 0)
         })
     
     return {
@@ -771,7 +680,7 @@ async def get_financial_summary_report(
 @router.post("/create-initial-admin", response_model=dict)
 async def create_initial_admin(admin_data: UserCreate):
     """Create the first admin user - this endpoint should be secured in production"""
-    db = await get_database()
+    db = get_database()
     
     # Check if any admin exists
     existing_admin = await db.users.find_one({"role": UserRole.ADMIN})
@@ -781,18 +690,17 @@ async def create_initial_admin(admin_data: UserCreate):
             detail="Admin user already exists"
         )
     
-    admin_data.role = UserRole.ADMIN
-    admin_data.first_login = False  # Admin sets password during creation
-    
     if not admin_data.password:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Password is required for admin creation"
         )
     
-    user_dict = admin_data.model_dump()
-    user_dict["password_hash"] = get_password_hash(admin_data.password)
-    del user_dict["password"]  # Remove plain password
+    # Skip unset optionals and the plain password rather than storing nulls
+    user_dict = admin_data.model_dump(exclude_none=True, exclude={"password", "role"})
+    user_dict["role"] = UserRole.ADMIN
+    user_dict["first_login"] = False  # Admin sets password during creation
+    user_dict["password_hash"] = await run_in_threadpool(get_password_hash, admin_data.password)
     
     result = await db.users.insert_one(user_dict)
     
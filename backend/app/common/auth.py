@@ -54,7 +54,7 @@ async def verify_token(token: str):
     except JWTError:
         raise credentials_exception
     
-    db = await get_database()
+    db = get_database()
     user = await db.users.find_one({"email": token_data.email})
     if user is None:
         raise credentials_exception
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from datetime import timedelta, datetime
 from typing import Optional
@@ -29,9 +30,12 @@ security = HTTPBasic()
 
 @router.post("/login", response_model=Token)
 async def login(credentials: HTTPBasicCredentials = Depends(security)):
-    db = await get_database()
+    db = get_database()
     
-    user = await db.users.find_one({"email": credentials.username})
+    user = await db.users.find_one(
+        {"email": credentials.username},
+        {"email": 1, "password_hash": 1, "is_active": 1}
+    )
     
     if not user:
         raise HTTPException(
@@ -40,16 +44,15 @@ async def login(credentials: HTTPBasicCredentials = Depends(security)):
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user_obj = User(**user)
-    
-    if not user_obj.password_hash or not verify_password(credentials.password, user_obj.password_hash):
+    password_hash = user.get("password_hash")
+    if not password_hash or not await run_in_threadpool(verify_password, credentials.password, password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    if not user_obj.is_active:
+    if not user.get("is_active", True):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inactive user"
@@ -57,30 +60,29 @@ async def login(credentials: HTTPBasicCredentials = Depends(security)):
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user_obj.email}, expires_delta=access_token_expires
+        data={"sub": user["email"]}, expires_delta=access_token_expires
     )
     
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/set-password")
 async def set_password(email: str, password: str):
-    db = await get_database()
+    db = get_database()
     
-    user = await db.users.find_one({"email": email})
+    user = await db.users.find_one({"email": email}, {"first_login": 1})
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    user_obj = User(**user)
-    if not user_obj.first_login:
+    if not user.get("first_login", True):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Password already set"
         )
     
-    hashed_password = get_password_hash(password)
+    hashed_password = await run_in_threadpool(get_password_hash, password)
     await db.users.update_one(
         {"email": email},
         {
@@ -102,25 +104,24 @@ async def read_users_me(current_user: User = Depends(get_current_active_user)):
 
 @router.get("/check-first-login")
 async def check_first_login(email: str):
-    db = await get_database()
+    db = get_database()
     
-    user = await db.users.find_one({"email": email})
+    user = await db.users.find_one({"email": email}, {"first_login": 1, "role": 1})
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    user_obj = User(**user)
     return {
-        "first_login": user_obj.first_login,
-        "role": user_obj.role
+        "first_login": user.get("first_login", True),
+        "role": UserRole(user["role"])
     }
 
 @router.post("/activate-user/{user_id}")
 async def activate_user(user_id: str, action: str):
     """Activate or reject a user account via email link"""
-    db = await get_database()
+    db = get_database()
     
     if action not in ["accept", "reject"]:
         raise HTTPException(
@@ -161,7 +162,7 @@ async def update_profile(
     current_user: User = Depends(get_current_active_user)
 ):
     """Update user profile"""
-    db = await get_database()
+    db = get_database()
     
     update_data = {}
     if request.name:
@@ -180,14 +181,13 @@ async def update_profile(
     update_data["updated_at"] = datetime.utcnow()
     
     try:
-        from bson import ObjectId
         await db.users.update_one(
-            {"_id": ObjectId(current_user.id)},
+            {"_id": current_user.id},
             {"$set": update_data}
         )
         
         # Return updated user
-        updated_user = await db.users.find_one({"_id": ObjectId(current_user.id)})
+        updated_user = await db.users.find_one({"_id": current_user.id})
         return serialize_user_document(updated_user)
         
     except Exception as e:
@@ -202,24 +202,23 @@ async def change_password(
     current_user: User = Depends(get_current_active_user)
 ):
     """Change user password"""
-    db = await get_database()
+    db = get_database()
     
     try:
-        from bson import ObjectId
         from .auth import verify_password, get_password_hash
         
         # Verify current password
-        user_doc = await db.users.find_one({"_id": ObjectId(current_user.id)})
-        if not user_doc or not verify_password(request.currentPassword, user_doc.get("password_hash", "")):
+        user_doc = await db.users.find_one({"_id": current_user.id})
+        if not user_doc or not await run_in_threadpool(verify_password, request.currentPassword, user_doc.get("password_hash", "")):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Current password is incorrect"
             )
         
         # Update password
-        new_password_hash = get_password_hash(request.newPassword)
+        new_password_hash = await run_in_threadpool(get_password_hash, request.newPassword)
         await db.users.update_one(
-            {"_id": ObjectId(current_user.id)},
+            {"_id": current_user.id},
             {
                 "$set": {
                     "password_hash": new_password_hash,
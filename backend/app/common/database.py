@@ -1,13 +1,18 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo.server_api import ServerApi
 import os
+import logging
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 class Database:
     client: AsyncIOMotorClient = None
     db = None
+    # Set once the unique users.email index is confirmed; until then routes pre-check emails
+    email_index_ready: bool = False
 
 database = Database()
 
@@ -19,23 +24,65 @@ async def init_database():
     database.client = AsyncIOMotorClient(
         mongodb_url,
         server_api=ServerApi('1'),
-        maxPoolSize=10,
-        minPoolSize=10,
+        maxPoolSize=int(os.getenv("MONGODB_MAX_POOL_SIZE", 50)),
+        minPoolSize=int(os.getenv("MONGODB_MIN_POOL_SIZE", 5)),
+        # Fail fast instead of queueing forever when the pool is saturated
+        waitQueueTimeoutMS=int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", 5000)),
+        # Surface an unreachable cluster in seconds rather than the 30s default
+        serverSelectionTimeoutMS=int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", 3000)),
+        # Wire compression; the server picks the first one it supports
+        compressors=os.getenv("MONGODB_COMPRESSORS", "zstd,zlib"),
+        zlibCompressionLevel=6,
+        retryWrites=True,
     )
     database.db = database.client[db_name]
     
     # Test connection
     try:
         await database.client.admin.command('ping')
-        print("Successfully connected to MongoDB!")
+        logger.info("Successfully connected to MongoDB")
     except Exception as e:
-        print(f"Error connecting to MongoDB: {e}")
+        logger.error("Error connecting to MongoDB: %s", e, exc_info=True)
+        return
+    
+    await ensure_indexes()
 
-async def get_database():
+async def ensure_indexes():
+    """Create the indexes backing the role/owner and status filters used by the routes"""
+    db = database.db
+    indexes = [
+        (db.users, [("role", 1), ("created_by", 1)], {}),
+        (db.users, [("email", 1)], {"unique": True}),
+        # Prefix (operator_id) also serves the plain $in matches in aggregations
+        (db.loan_applications, [("operator_id", 1), ("status", 1)], {}),
+        # Manager-scoped queries filter on the denormalized manager_id
+        (db.loan_applications, [("manager_id", 1), ("status", 1)], {}),
+        # Date-ranged reports and newest-first listings
+        (db.loan_applications, [("operator_id", 1), ("created_at", 1)], {}),
+        (db.loan_applications, [("manager_id", 1), ("created_at", 1)], {}),
+    ]
+    for collection, keys, options in indexes:
+        try:
+            await collection.create_index(keys, **options)
+            # Motor builds a new collection object per attribute access, so compare by name
+            if collection.name == "users" and keys == [("email", 1)]:
+                database.email_index_ready = True
+        except Exception as e:
+            # e.g. existing duplicate emails block the unique index; keep serving
+            logger.warning("Failed to create index %s on %s: %s", keys, collection.name, e)
+
+def get_database():
     """Get database instance"""
     return database.db
 
+def email_index_ready() -> bool:
+    """Whether the unique email index is known to exist, so inserts alone reject duplicates"""
+    return database.email_index_ready
+
 async def close_database():
     """Close database connection"""
     if database.client:
-        database.client.close()
\ No newline at end of file
+        database.client.close()
+        database.client = None
+        database.db = None
+        database.email_index_ready = False
\ No newline at end of file
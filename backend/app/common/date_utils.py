@@ -0,0 +1,10 @@
+from datetime import datetime
+
+def month_start(dt: datetime, months_back: int = 0) -> datetime:
+    """Return midnight on the first day of the month `months_back` calendar months before dt"""
+    year, month = divmod(dt.year * 12 + (dt.month - 1) - months_back, 12)
+    return datetime(year, month + 1, 1)
+
+def next_month_start(dt: datetime) -> datetime:
+    """Return midnight on the first day of the month after dt"""
+    return month_start(dt, -1)
@@ -1,30 +1,29 @@
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import smtplib
-from typing import Dict, Any
+import asyncio
+import threading
+from typing import Dict, Any, Optional
 import os
-from jinja2 import Template
+import re
+import logging
+from functools import lru_cache
+from types import SimpleNamespace
+from jinja2 import Environment
 
-class EmailService:
-    def __init__(self):
-        self.smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-        self.smtp_port = int(os.getenv("SMTP_PORT", "587"))
-        self.smtp_username = os.getenv("SMTP_USERNAME", "")
-        self.smtp_password = os.getenv("SMTP_PASSWORD", "")
-        self.from_email = os.getenv("FROM_EMAIL", self.smtp_username)
-        self.base_url = os.getenv("FRONTEND_URL", "http://localhost:5173")
+logger = logging.getLogger(__name__)
 
-    async def send_user_creation_notification(
-        self, 
-        user_email: str, 
-        user_name: str, 
-        user_role: str, 
-        temporary_password: str,
-        created_by_name: str
-    ) -> bool:
-        """Send simple email notification for new user creation"""
-        
-        template = Template("""
+_LINE_INDENT = re.compile(r"\s*\n\s*")
+
+def _minify_html(html: str) -> str:
+    """Drop source indentation and blank lines; a single newline renders the same as the removed run"""
+    return _LINE_INDENT.sub("\n", html).strip()
+
+# Shared environment so templates compile once; user-supplied values are HTML-escaped
+_template_env = Environment(autoescape=True)
+
+# Email templates are minified and compiled once at import instead of on every send
+USER_CREATION_TEMPLATE = _template_env.from_string(_minify_html("""
         <!DOCTYPE html>
         <html>
         <head>
@@ -111,43 +110,9 @@ class EmailService:
             </div>
         </body>
         </html>
-        """)
-        
-        html_content = template.render(
-            user_name=user_name,
-            user_email=user_email,
-            user_role=user_role,
-            temporary_password=temporary_password,
-            created_by_name=created_by_name,
-            login_url=f"{self.base_url}/login"
-        )
-        
-        try:
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = f"Account Created - Domestic Loan Management ({user_role.title()})"
-            msg['From'] = self.from_email
-            msg['To'] = user_email
-            
-            html_part = MIMEText(html_content, 'html')
-            msg.attach(html_part)
-            
-            # Send email
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.smtp_username, self.smtp_password)
-            text = msg.as_string()
-            server.sendmail(self.from_email, user_email, text)
-            server.quit()
-            
-            return True
-        except Exception as e:
-            print(f"Failed to send email: {str(e)}")
-            return False
+        """))
 
-    async def send_password_reset_email(self, user_email: str, user_name: str, reset_token: str) -> bool:
-        """Send password reset email"""
-        
-        template = Template("""
+PASSWORD_RESET_TEMPLATE = _template_env.from_string(_minify_html("""
         <!DOCTYPE html>
         <html>
         <head>
@@ -192,9 +157,112 @@ class EmailService:
             </div>
         </body>
         </html>
-        """)
+        """))
+
+@lru_cache(maxsize=1)
+def _email_config() -> SimpleNamespace:
+    """Read SMTP settings from the environment once per process"""
+    smtp_username = os.getenv("SMTP_USERNAME", "")
+    return SimpleNamespace(
+        smtp_server=os.getenv("SMTP_SERVER", "smtp.gmail.com"),
+        smtp_port=int(os.getenv("SMTP_PORT", "587")),
+        # Bounds every socket operation so a stalled server cannot hold the shared connection's lock
+        smtp_timeout=float(os.getenv("SMTP_TIMEOUT_SECONDS", "30")),
+        smtp_username=smtp_username,
+        smtp_password=os.getenv("SMTP_PASSWORD", ""),
+        from_email=os.getenv("FROM_EMAIL", smtp_username),
+        base_url=os.getenv("FRONTEND_URL", "http://localhost:5173"),
+    )
+
+class EmailService:
+    def __init__(self):
+        config = _email_config()
+        self.smtp_server = config.smtp_server
+        self.smtp_port = config.smtp_port
+        self.smtp_timeout = config.smtp_timeout
+        self.smtp_username = config.smtp_username
+        self.smtp_password = config.smtp_password
+        self.from_email = config.from_email
+        self.base_url = config.base_url
+        self._smtp: Optional[smtplib.SMTP] = None
+        # Sends run in worker threads, so the shared connection needs a lock
+        self._smtp_lock = threading.Lock()
+
+    def _get_connection(self) -> smtplib.SMTP:
+        """Return a logged-in SMTP connection, reusing the previous one while it is alive"""
+        if self._smtp is not None:
+            try:
+                self._smtp.noop()
+                return self._smtp
+            except (smtplib.SMTPException, OSError):
+                self._close_connection()
+        
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.smtp_timeout)
+        server.starttls()
+        server.login(self.smtp_username, self.smtp_password)
+        self._smtp = server
+        return server
+
+    def _close_connection(self) -> None:
+        """Drop the cached SMTP connection"""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except Exception:
+            # Connection is already gone
+            pass
+        self._smtp = None
+
+    def _send_message(self, msg: MIMEMultipart, to_email: str) -> None:
+        """Send a message over the shared connection, reconnecting once if the server dropped it"""
+        with self._smtp_lock:
+            try:
+                self._get_connection().sendmail(self.from_email, to_email, msg.as_string())
+            except smtplib.SMTPServerDisconnected:
+                self._close_connection()
+                self._get_connection().sendmail(self.from_email, to_email, msg.as_string())
+
+    async def send_user_creation_notification(
+        self, 
+        user_email: str, 
+        user_name: str, 
+        user_role: str, 
+        temporary_password: str,
+        created_by_name: str
+    ) -> bool:
+        """Send simple email notification for new user creation"""
+        
+        html_content = USER_CREATION_TEMPLATE.render(
+            user_name=user_name,
+            user_email=user_email,
+            user_role=user_role,
+            temporary_password=temporary_password,
+            created_by_name=created_by_name,
+            login_url=f"{self.base_url}/login"
+        )
+        
+        try:
+            msg = MIMEMultipart('alternative')
+            msg['Subject'] = f"Account Created - Domestic Loan Management ({user_role.title()})"
+            msg['From'] = self.from_email
+            msg['To'] = user_email
+            
+            html_part = MIMEText(html_content, 'html', 'utf-8')
+            msg.attach(html_part)
+            
+            # Send email without blocking the event loop
+            await asyncio.to_thread(self._send_message, msg, user_email)
+            
+            return True
+        except Exception as e:
+            logger.warning("Failed to send email to %s: %s", user_email, e, exc_info=True)
+            return False
+
+    async def send_password_reset_email(self, user_email: str, user_name: str, reset_token: str) -> bool:
+        """Send password reset email"""
         
-        html_content = template.render(
+        html_content = PASSWORD_RESET_TEMPLATE.render(
             user_name=user_name,
             reset_url=f"{self.base_url}/reset-password?token={reset_token}"
         )
@@ -205,19 +273,14 @@ class EmailService:
             msg['From'] = self.from_email
             msg['To'] = user_email
             
-            html_part = MIMEText(html_content, 'html')
+            html_part = MIMEText(html_content, 'html', 'utf-8')
             msg.attach(html_part)
             
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.smtp_username, self.smtp_password)
-            text = msg.as_string()
-            server.sendmail(self.from_email, user_email, text)
-            server.quit()
+            await asyncio.to_thread(self._send_message, msg, user_email)
             
             return True
         except Exception as e:
-            print(f"Failed to send password reset email: {str(e)}")
+            logger.warning("Failed to send password reset email to %s: %s", user_email, e, exc_info=True)
             return False
 
 # Singleton instance
@@ -235,7 +298,7 @@ async def send_user_creation_notification(
     try:
         # Check if email service is configured
         if not email_service.smtp_username or not email_service.smtp_password:
-            print("Email service not configured - skipping email notification")
+            logger.warning("Email service not configured - skipping email notification")
             return False
             
         return await email_service.send_user_creation_notification(
@@ -246,5 +309,5 @@ async def send_user_creation_notification(
             created_by_name=created_by_name
         )
     except Exception as e:
-        print(f"Email notification failed: {str(e)}")
+        logger.warning("Email notification failed: %s", e, exc_info=True)
         return False
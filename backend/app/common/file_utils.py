@@ -1,21 +1,23 @@
+import io
 import os
 import uuid
+from functools import lru_cache
 from typing import Optional
 from fastapi import UploadFile, HTTPException, status
 from PIL import Image
-import shutil
 from pathlib import Path
 
 # Configuration
 UPLOAD_DIR = Path("uploads")
 PROFILE_DIR = UPLOAD_DIR / "profiles"
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
-ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
+ALLOWED_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".gif", ".webp"})
 MAX_IMAGE_SIZE = (800, 800)  # Max dimensions
 
-# Ensure upload directories exist
-UPLOAD_DIR.mkdir(exist_ok=True)
-PROFILE_DIR.mkdir(exist_ok=True)
+@lru_cache(maxsize=1)
+def ensure_upload_dirs() -> None:
+    """Create the upload directories on first use instead of at import time"""
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
 
 def validate_image_file(file: UploadFile) -> None:
     """Validate uploaded image file"""
@@ -28,7 +30,7 @@ def validate_image_file(file: UploadFile) -> None:
     
     # Check file extension
     if file.filename:
-        file_ext = Path(file.filename).suffix.lower()
+        file_ext = os.path.splitext(file.filename)[1].lower()
         if file_ext not in ALLOWED_EXTENSIONS:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -44,38 +46,43 @@ def save_profile_image(file: UploadFile, user_id: str) -> str:
     """Save and process profile image"""
     try:
         validate_image_file(file)
+        ensure_upload_dirs()
         
         # Generate unique filename
-        file_ext = Path(file.filename).suffix.lower()
+        file_ext = os.path.splitext(file.filename)[1].lower()
         unique_filename = f"{user_id}_{uuid.uuid4().hex}{file_ext}"
         file_path = PROFILE_DIR / unique_filename
+        tmp_path = PROFILE_DIR / f"tmp_{unique_filename}"
         
-        # Save the file temporarily
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Decode and resize in memory so only the optimized image touches disk.
+        # Read at most one byte past the limit so oversized uploads are never fully buffered.
+        data = file.file.read(MAX_FILE_SIZE + 1)
+        if len(data) > MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File size exceeds maximum limit of {MAX_FILE_SIZE // 1024 // 1024}MB"
+            )
         
-        # Process image with PIL
         try:
-            with Image.open(file_path) as img:
+            with Image.open(io.BytesIO(data)) as img:
+                # Let libjpeg downscale during decode (no-op for other formats)
+                img.draft('RGB', MAX_IMAGE_SIZE)
+                
                 # Convert to RGB if necessary
                 if img.mode in ('RGBA', 'LA', 'P'):
                     img = img.convert('RGB')
                 
                 # Resize if necessary
-                img.thumbnail(MAX_IMAGE_SIZE, Image.Resampling.LANCZOS)
-                
-                # Save optimized image
-                optimized_path = PROFILE_DIR / f"opt_{unique_filename}"
-                img.save(optimized_path, optimize=True, quality=85)
+                img.thumbnail(MAX_IMAGE_SIZE, Image.Resampling.BILINEAR)
                 
-                # Remove original and rename optimized
-                os.remove(file_path)
-                os.rename(optimized_path, file_path)
+                # Save optimized image next to the target, then atomically swap it in
+                img.save(tmp_path, optimize=True, quality=85)
+            os.replace(tmp_path, file_path)
         
         except Exception as e:
             # Clean up on error
-            if file_path.exists():
-                os.remove(file_path)
+            if tmp_path.exists():
+                os.remove(tmp_path)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Error processing image: {str(e)}"
@@ -98,9 +105,7 @@ def delete_profile_image(image_path: Optional[str]) -> None:
         return
         
     try:
-        full_path = UPLOAD_DIR / image_path
-        if full_path.exists():
-            os.remove(full_path)
+        os.remove(UPLOAD_DIR / image_path)
     except Exception:
         # Ignore errors when deleting files
         pass
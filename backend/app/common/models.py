@@ -5,19 +5,20 @@ from typing import Optional, List, Any
 from datetime import datetime
 from enum import Enum
 from bson import ObjectId
+from bson.errors import InvalidId
 
 class PyObjectId(ObjectId):
     @classmethod
     def __get_pydantic_core_schema__(cls, source_type: Any, handler):
+        from_str = core_schema.no_info_after_validator_function(cls.validate, core_schema.str_schema())
         return core_schema.json_or_python_schema(
-            json_schema=core_schema.str_schema(),
+            json_schema=from_str,
+            # ObjectIds read from Mongo take the first branch without calling into Python;
+            # left_to_right stops there instead of scoring every branch like smart mode
             python_schema=core_schema.union_schema([
                 core_schema.is_instance_schema(ObjectId),
-                core_schema.chain_schema([
-                    core_schema.str_schema(),
-                    core_schema.no_info_plain_validator_function(cls.validate),
-                ])
-            ]),
+                from_str,
+            ], mode='left_to_right'),
             serialization=core_schema.plain_serializer_function_ser_schema(
                 str, return_schema=core_schema.str_schema(), when_used='json'
             ),
@@ -25,9 +26,10 @@ class PyObjectId(ObjectId):
 
     @classmethod
     def validate(cls, v):
-        if not ObjectId.is_valid(v):
+        try:
+            return ObjectId(v)
+        except (InvalidId, TypeError):
             raise ValueError("Invalid ObjectId")
-        return ObjectId(v)
 
     @classmethod
     def __get_pydantic_json_schema__(cls, schema: core_schema.CoreSchema, handler: GetJsonSchemaHandler) -> JsonSchemaValue:
@@ -91,6 +93,8 @@ class FamilyMember(BaseModel):
     age: int
     occupation: str
 
+    model_config = ConfigDict(frozen=True)
+
 # Applicant Models
 class ApplicantBase(BaseModel):
     name: str
@@ -148,10 +152,14 @@ class VerificationItem(BaseModel):
     status: bool
     notes: Optional[str] = None
 
+    model_config = ConfigDict(frozen=True)
+
 class VerificationChecklist(BaseModel):
     items: List[VerificationItem] = []
     overall_status: bool = False
 
+    model_config = ConfigDict(frozen=True)
+
 # Loan Application Models
 class LoanApplicationBase(BaseModel):
     applicant_id: PyObjectId
@@ -186,5 +194,9 @@ class Token(BaseModel):
     access_token: str
     token_type: str
 
+    model_config = ConfigDict(frozen=True)
+
 class TokenData(BaseModel):
-    email: Optional[str] = None
\ No newline at end of file
+    email: Optional[str] = None
+
+    model_config = ConfigDict(frozen=True)
\ No newline at end of file
@@ -1,23 +1,46 @@
+import asyncio
+import orjson
 from bson import ObjectId
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from datetime import datetime
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+
+_PLAIN_TYPES = frozenset((str, int, float, bool, type(None)))
 
 def serialize_objectid(obj: Any) -> Any:
     """Convert ObjectId and datetime objects to strings for JSON serialization"""
-    if isinstance(obj, ObjectId):
-        return str(obj)
-    elif isinstance(obj, datetime):
-        return obj.isoformat()
-    elif isinstance(obj, dict):
-        serialized = {key: serialize_objectid(value) for key, value in obj.items()}
-        # Rename _id to id for frontend compatibility
-        if '_id' in serialized:
-            serialized['id'] = serialized['_id']
-            del serialized['_id']
-        return serialized
-    elif isinstance(obj, list):
-        return [serialize_objectid(item) for item in obj]
-    return obj
+    # Worklist walk instead of recursion: no Python frame per node, exact-type checks
+    # for the common leaves, and each dict/list is copied exactly once
+    plain, object_id, dt, to_str = _PLAIN_TYPES, ObjectId, datetime, str
+    result = [None]
+    stack = [(enumerate((obj,)), result)]
+    pop, push = stack.pop, stack.append
+    while stack:
+        items, target = pop()
+        for key, value in items:
+            cls = type(value)
+            if cls in plain:
+                pass
+            elif cls is object_id:
+                value = to_str(value)
+            elif cls is dt:
+                value = value.isoformat()
+            elif isinstance(value, dict):
+                copy = {}
+                push((value.items(), copy))
+                value = copy
+            elif isinstance(value, list):
+                copy = [None] * len(value)
+                push((enumerate(value), copy))
+                value = copy
+            elif isinstance(value, object_id):
+                value = to_str(value)
+            elif isinstance(value, dt):
+                value = value.isoformat()
+            # Rename _id to id for frontend compatibility
+            target['id' if key == '_id' else key] = value
+    return result[0]
 
 def serialize_user_document(user_doc: Dict[str, Any]) -> Dict[str, Any]:
     """Convert a MongoDB user document to a properly serialized dictionary"""
@@ -34,4 +57,95 @@ def serialize_user_document(user_doc: Dict[str, Any]) -> Dict[str, Any]:
 
 def serialize_document_list(documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Convert a list of MongoDB documents to properly serialized dictionaries"""
-    return [serialize_user_document(doc) for doc in documents]
\ No newline at end of file
+    return [serialize_user_document(doc) for doc in documents]
+
+def _encode(obj: Any) -> bytes:
+    """Walk the documents once for id/ObjectId/datetime conversion, then let orjson write the bytes"""
+    return orjson.dumps(serialize_objectid(obj))
+
+def json_response(obj: Any) -> Response:
+    """Serialize Mongo documents straight to a JSON response body"""
+    # Returning a Response skips FastAPI's response_model validation and
+    # jsonable_encoder pass, which would re-walk the whole result in Python
+    return Response(content=_encode(obj), media_type="application/json")
+
+_CURSOR_DONE = object()
+
+async def prefetch(cursor, buffer_size: int = 1000):
+    """Iterate a Motor cursor while a background task already pulls the next batches"""
+    # Overlaps the network round-trips for getMore with the caller's per-document work
+    queue = asyncio.Queue(maxsize=buffer_size)
+    
+    async def pump():
+        try:
+            async for doc in cursor:
+                await queue.put(doc)
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(_CURSOR_DONE)
+    
+    task = asyncio.create_task(pump())
+    try:
+        while True:
+            item = await queue.get()
+            if item is _CURSOR_DONE:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        task.cancel()
+
+async def _primed(cursor):
+    """Start prefetching and wait for the first document before any response is built"""
+    # A failing query then raises while a 500 can still be sent instead of after the 200 is out
+    documents = prefetch(cursor)
+    try:
+        first = await documents.__anext__()
+    except StopAsyncIteration:
+        first = _CURSOR_DONE
+    
+    async def primed():
+        if first is _CURSOR_DONE:
+            return
+        yield first
+        async for doc in documents:
+            yield doc
+    
+    return primed()
+
+def stream_json_array(documents) -> StreamingResponse:
+    """Stream documents as a JSON array, serializing one document at a time"""
+    async def generate():
+        separator = b""
+        yield b"["
+        # A cursor error past this point propagates and the server drops the connection,
+        # so the client sees a truncated body rather than a closed, valid-looking array
+        async for doc in documents:
+            yield separator + _encode(doc)
+            separator = b","
+        yield b"]"
+    
+    return StreamingResponse(generate(), media_type="application/json")
+
+def stream_ndjson(documents) -> StreamingResponse:
+    """Stream documents as newline-delimited JSON, one document per line"""
+    async def generate():
+        try:
+            async for doc in documents:
+                yield _encode(doc) + b"\n"
+        except Exception:
+            # Every line already sent is valid on its own, so a dropped connection could pass
+            # for a complete result; emit a final error record before aborting
+            yield _encode({"error": "stream interrupted"}) + b"\n"
+            raise
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+async def stream_documents(cursor, accept: Optional[str]) -> StreamingResponse:
+    """Stream as NDJSON when the client asks for it, otherwise as the usual JSON array"""
+    documents = await _primed(cursor)
+    if accept and "application/x-ndjson" in accept:
+        return stream_ndjson(documents)
+    return stream_json_array(documents)
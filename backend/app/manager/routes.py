@@ -1,15 +1,19 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List, Optional
+import asyncio
+from fastapi.concurrency import run_in_threadpool
+from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks, Query, Header
+from typing import Optional
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
 from pydantic import BaseModel
 
 from ..common.models import (
-    User, UserCreate, UserRole, LoanApplication, LoanStatus, UserUpdate
+    User, UserCreate, UserRole, LoanApplication, LoanStatus, UserUpdate, PyObjectId
 )
 from ..common.auth import get_current_active_user, get_password_hash
-from ..common.database import get_database
-from ..common.serializers import serialize_user_document, serialize_document_list, serialize_objectid
+from ..common.database import get_database, email_index_ready
+from ..common.date_utils import month_start
+from ..common.serializers import serialize_user_document, serialize_document_list, json_response, stream_documents
 from ..common.email_service import email_service
 
 class CreateOperatorRequest(BaseModel):
@@ -32,52 +36,57 @@ def require_manager(current_user: User = Depends(get_current_active_user)):
 @router.post("/operators", response_model=dict)
 async def create_operator(
     request: CreateOperatorRequest,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(require_manager)
 ):
-    db = await get_database()
+    db = get_database()
     
-    # Check if email already exists
-    existing = await db.users.find_one({"email": request.email})
-    if existing:
+    # Without a confirmed unique email index (startup could not create it) fall back to a pre-check
+    if not email_index_ready() and await db.users.find_one({"email": request.email}, {"_id": 1}):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User with this email already exists"
         )
     
     # Create operator data
+    now = datetime.utcnow()
     user_dict = {
         "name": request.name,
         "email": request.email,
         "phone": request.phone,
         "role": UserRole.OPERATOR,
         "is_active": True,  # Active by default
-        "created_by": ObjectId(current_user.id),
-        "password_hash": get_password_hash(request.password),
+        "created_by": current_user.id,
+        "password_hash": await run_in_threadpool(get_password_hash, request.password),
         "first_login": False,
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow()
+        "created_at": now,
+        "updated_at": now
     }
     
     # Add profile image as base64 if provided
     if request.profile_image_base64:
         user_dict["profile_image_base64"] = request.profile_image_base64
     
-    # Insert user
-    result = await db.users.insert_one(user_dict)
-    user_id = str(result.inserted_id)
-    
-    # Send email notification with password and activation link
+    # Insert user; the unique email index rejects duplicates atomically
     try:
-        await email_service.send_user_creation_notification(
-            user_email=request.email,
-            user_name=request.name,
-            user_role="operator",
-            temporary_password=request.password,
-            created_by_name=current_user.name
+        result = await db.users.insert_one(user_dict)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User with this email already exists"
         )
-    except Exception as e:
-        # Log error but don't fail the user creation
-        print(f"Failed to send email notification: {e}")
+    user_id = str(result.inserted_id)
+    
+    # Send email notification after the response goes out; SMTP can take seconds
+    # and send_user_creation_notification logs its own failures
+    background_tasks.add_task(
+        email_service.send_user_creation_notification,
+        user_email=request.email,
+        user_name=request.name,
+        user_role="operator",
+        temporary_password=request.password,
+        created_by_name=current_user.name
+    )
     
     return {
         "id": user_id,
@@ -85,32 +94,30 @@ async def create_operator(
         "message": "Operator created successfully and is now active. Email notification sent."
     }
 
-@router.get("/operators", response_model=List[dict])
+@router.get("/operators", response_model=None)
 async def get_operators(
     current_user: User = Depends(require_manager)
 ):
-    db = await get_database()
-    operators = []
+    db = get_database()
     
-    async for user in db.users.find({
+    operators = await db.users.find({
         "role": UserRole.OPERATOR,
-        "created_by": ObjectId(current_user.id)
-    }):
-        operators.append(serialize_user_document(user))
+        "created_by": current_user.id
+    }).to_list(length=None)
     
-    return operators
+    return json_response(operators)
 
 @router.get("/operators/{operator_id}", response_model=dict)
 async def get_operator(
-    operator_id: str,
+    operator_id: PyObjectId,
     current_user: User = Depends(require_manager)
 ):
-    db = await get_database()
+    db = get_database()
     
     operator = await db.users.find_one({
-        "_id": ObjectId(operator_id),
+        "_id": operator_id,
         "role": UserRole.OPERATOR,
-        "created_by": ObjectId(current_user.id)
+        "created_by": current_user.id
     })
     
     if not operator:
@@ -123,84 +130,126 @@ async def get_operator(
 
 @router.put("/operators/{operator_id}", response_model=dict)
 async def update_operator(
-    operator_id: str,
+    operator_id: PyObjectId,
     operator_update: UserUpdate,
     current_user: User = Depends(require_manager)
 ):
-    db = await get_database()
+    db = get_database()
     
-    # Verify the operator exists and belongs to this manager
-    existing = await db.users.find_one({
-        "_id": ObjectId(operator_id),
-        "role": UserRole.OPERATOR,
-        "created_by": ObjectId(current_user.id)
-    })
+    update_data = operator_update.model_dump(exclude_unset=True, exclude_none=True)
+    update_data["updated_at"] = datetime.utcnow()
+    
+    # The ownership filter doubles as the existence check, so no read precedes the write
+    result = await db.users.update_one(
+        {
+            "_id": operator_id,
+            "role": UserRole.OPERATOR,
+            "created_by": current_user.id
+        },
+        {"$set": update_data}
+    )
     
-    if not existing:
+    if result.matched_count == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Operator not found"
         )
     
-    update_data = {k: v for k, v in operator_update.model_dump().items() if v is not None}
-    update_data["updated_at"] = datetime.utcnow()
-    
-    await db.users.update_one(
-        {"_id": ObjectId(operator_id)},
-        {"$set": update_data}
-    )
-    
     return {"message": "Operator updated successfully"}
 
 @router.delete("/operators/{operator_id}", response_model=dict)
 async def delete_operator(
-    operator_id: str,
+    operator_id: PyObjectId,
     current_user: User = Depends(require_manager)
 ):
-    db = await get_database()
+    db = get_database()
     
-    # Verify the operator exists and belongs to this manager
-    existing = await db.users.find_one({
-        "_id": ObjectId(operator_id),
+    result = await db.users.delete_one({
+        "_id": operator_id,
         "role": UserRole.OPERATOR,
-        "created_by": ObjectId(current_user.id)
+        "created_by": current_user.id
     })
     
-    if not existing:
+    if result.deleted_count == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Operator not found"
         )
     
-    await db.users.delete_one({"_id": ObjectId(operator_id)})
-    
     return {"message": "Operator deleted successfully"}
 
-@router.get("/loan-applications", response_model=List[dict])
+# Fields the manager review screen renders; everything else (verification payloads,
+# password hashes, profile images) stays in the database
+APPLICATION_REVIEW_FIELDS = {field: 1 for field in (
+    "application_number", "applicant_id", "animal_id", "operator_id", "manager_id",
+    "loan_amount", "purpose", "repayment_period", "status", "rejection_reason",
+    "verification_checklist", "created_at", "updated_at", "approved_at"
+)}
+APPLICANT_REVIEW_FIELDS = {field: 1 for field in (
+    "name", "email", "phone", "address", "aadhar_number", "annual_income", "bank_name"
+)}
+ANIMAL_REVIEW_FIELDS = {field: 1 for field in (
+    "type", "breed", "age", "weight", "health_status", "market_value"
+)}
+
+@router.get("/loan-applications", response_model=None)
 async def get_loan_applications(
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    after: Optional[PyObjectId] = None,
+    accept: Optional[str] = Header(None),
     current_user: User = Depends(require_manager)
 ):
-    db = await get_database()
-    
-    # Get all operators created by this manager
-    operator_ids = []
-    async for operator in db.users.find({
-        "role": UserRole.OPERATOR,
-        "created_by": ObjectId(current_user.id)
-    }):
-        operator_ids.append(operator["_id"])
-    
-    if not operator_ids:
-        return []
-    
-    applications = []
+    db = get_database()
+    
+    # Start from this manager's operators (users role/created_by index) and join their
+    # applications through the operator_id index, so no separate operator-id query is needed.
+    # The operator document is already at hand and becomes the `operator` field.
+    # Each joined collection is projected inside its own $lookup so no stage ever
+    # carries more than the review fields
+    application_match = {}
+    application_lookup = {
+        "from": "loan_applications",
+        "localField": "_id",
+        "foreignField": "operator_id",
+        "pipeline": [{"$match": application_match}, {"$project": APPLICATION_REVIEW_FIELDS}],
+        "as": "application"
+    }
     pipeline = [
-        {"$match": {"operator_id": {"$in": operator_ids}}},
+        {"$match": {"role": UserRole.OPERATOR, "created_by": current_user.id}},
+        {"$project": {"name": 1, "email": 1}},
+        {"$lookup": application_lookup},
+        {"$unwind": "$application"},
+        {
+            "$replaceRoot": {
+                "newRoot": {
+                    "$mergeObjects": ["$application", {"operator": [{"name": "$name", "email": "$email"}]}]
+                }
+            }
+        }
+    ]
+    
+    # Optional keyset pagination, newest first: pass the last id seen as `after`.
+    # Each operator's sub-pipeline is cut to `limit` before the unwind, and the merged
+    # page is cut again before the applicant/animal lookups, so only `limit` documents get joined
+    if limit is not None or after is not None:
+        if after is not None:
+            application_match["_id"] = {"$lt": after}
+        page = [{"$sort": {"_id": -1}}]
+        if limit is not None:
+            page.append({"$limit": limit})
+            application_lookup["pipeline"][1:1] = page
+        pipeline += page
+    else:
+        # Keep the creation order the collection scan used to return
+        pipeline.append({"$sort": {"_id": 1}})
+    
+    pipeline += [
         {
             "$lookup": {
                 "from": "applicants",
                 "localField": "applicant_id",
                 "foreignField": "_id",
+                "pipeline": [{"$project": APPLICANT_REVIEW_FIELDS}],
                 "as": "applicant"
             }
         },
@@ -209,113 +258,121 @@ async def get_loan_applications(
                 "from": "animals",
                 "localField": "animal_id",
                 "foreignField": "_id", 
+                "pipeline": [{"$project": ANIMAL_REVIEW_FIELDS}],
                 "as": "animal"
             }
-        },
-        {
-            "$lookup": {
-                "from": "users",
-                "localField": "operator_id",
-                "foreignField": "_id",
-                "as": "operator"
-            }
         }
     ]
     
-    async for app in db.loan_applications.aggregate(pipeline):
-        applications.append(serialize_objectid(app))
-    
-    return applications
+    return await stream_documents(db.users.aggregate(pipeline, batchSize=1000), accept)
 
-@router.put("/loan-applications/{app_id}/approve", response_model=dict)
-async def approve_loan_application(
-    app_id: str,
-    current_user: User = Depends(require_manager)
-):
-    db = await get_database()
-    
-    # Get the application and verify it's from one of this manager's operators
-    app = await db.loan_applications.find_one({"_id": ObjectId(app_id)})
+async def _check_unmatched_application(db, app_id: ObjectId, manager_id: ObjectId, action: str):
+    """Work out why a guarded approve/reject write matched nothing; only runs on the error path"""
+    # Returns (instead of raising) only for an application saved before manager_id was
+    # denormalized that belongs to one of this manager's operators: it is stamped with
+    # manager_id so the caller can retry the guarded write
+    app = await db.loan_applications.find_one(
+        {"_id": app_id},
+        {"manager_id": 1, "operator_id": 1, "status": 1}
+    )
     if not app:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Loan application not found"
         )
     
-    # Verify the operator belongs to this manager
-    operator = await db.users.find_one({
-        "_id": app["operator_id"],
-        "created_by": ObjectId(current_user.id)
-    })
-    
-    if not operator:
+    if app.get("manager_id") is None:
+        operator = await db.users.find_one({
+            "_id": app.get("operator_id"),
+            "role": UserRole.OPERATOR,
+            "created_by": manager_id
+        }, {"_id": 1})
+        if operator:
+            await db.loan_applications.update_one(
+                {"_id": app_id, "manager_id": None},
+                {"$set": {"manager_id": manager_id}}
+            )
+            return
+    
+    if app.get("manager_id") != manager_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="You can only approve applications from your operators"
+            detail=f"You can only {action} applications from your operators"
         )
     
-    # Check if application is verified
-    if app["status"] != LoanStatus.VERIFIED:
+    if action == "approve" and app.get("status") != LoanStatus.VERIFIED:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Application must be verified before approval"
         )
     
-    # Approve the application
-    await db.loan_applications.update_one(
-        {"_id": ObjectId(app_id)},
-        {
-            "$set": {
-                "status": LoanStatus.APPROVED,
-                "manager_id": ObjectId(current_user.id),
-                "approved_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow()
-            }
-        }
+    # Owned and in the right state now, so it changed between the write and this read
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Loan application changed while trying to {action} it, please retry"
     )
+
+@router.put("/loan-applications/{app_id}/approve", response_model=dict)
+async def approve_loan_application(
+    app_id: PyObjectId,
+    current_user: User = Depends(require_manager)
+):
+    db = get_database()
+    
+    # Approve only if the application is verified and belongs to this manager;
+    # the filter makes the ownership/status checks and the write a single atomic operation
+    now = datetime.utcnow()
+    guard = {
+        "_id": app_id,
+        "manager_id": current_user.id,
+        "status": LoanStatus.VERIFIED
+    }
+    change = {
+        "$set": {
+            "status": LoanStatus.APPROVED,
+            "approved_at": now,
+            "updated_at": now
+        }
+    }
+    result = await db.loan_applications.update_one(guard, change)
+    
+    if result.matched_count == 0:
+        await _check_unmatched_application(db, app_id, current_user.id, "approve")
+        # Legacy application just stamped with manager_id; a second miss always raises
+        result = await db.loan_applications.update_one(guard, change)
+        if result.matched_count == 0:
+            await _check_unmatched_application(db, app_id, current_user.id, "approve")
     
     return {"message": "Loan application approved successfully"}
 
 @router.put("/loan-applications/{app_id}/reject", response_model=dict)
 async def reject_loan_application(
-    app_id: str,
+    app_id: PyObjectId,
     reason: str,
     current_user: User = Depends(require_manager)
 ):
-    db = await get_database()
-    
-    # Get the application and verify it's from one of this manager's operators
-    app = await db.loan_applications.find_one({"_id": ObjectId(app_id)})
-    if not app:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Loan application not found"
-        )
-    
-    # Verify the operator belongs to this manager
-    operator = await db.users.find_one({
-        "_id": app["operator_id"],
-        "created_by": ObjectId(current_user.id)
-    })
-    
-    if not operator:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You can only reject applications from your operators"
-        )
+    db = get_database()
     
-    # Reject the application
-    await db.loan_applications.update_one(
-        {"_id": ObjectId(app_id)},
-        {
-            "$set": {
-                "status": LoanStatus.REJECTED,
-                "manager_id": ObjectId(current_user.id),
-                "rejection_reason": reason,
-                "updated_at": datetime.utcnow()
-            }
+    # Reject only if the application belongs to this manager
+    guard = {
+        "_id": app_id,
+        "manager_id": current_user.id
+    }
+    change = {
+        "$set": {
+            "status": LoanStatus.REJECTED,
+            "rejection_reason": reason,
+            "updated_at": datetime.utcnow()
         }
-    )
+    }
+    result = await db.loan_applications.update_one(guard, change)
+    
+    if result.matched_count == 0:
+        await _check_unmatched_application(db, app_id, current_user.id, "reject")
+        # Legacy application just stamped with manager_id; a second miss always raises
+        result = await db.loan_applications.update_one(guard, change)
+        if result.matched_count == 0:
+            await _check_unmatched_application(db, app_id, current_user.id, "reject")
     
     return {"message": "Loan application rejected successfully"}
 
@@ -323,142 +380,102 @@ async def reject_loan_application(
 async def get_dashboard_stats(
     current_user: User = Depends(require_manager)
 ):
-    db = await get_database()
-    
-    # Get operator count
-    operator_count = await db.users.count_documents({
-        "role": UserRole.OPERATOR,
-        "created_by": ObjectId(current_user.id)
-    })
-    
-    # Get all operator IDs for this manager
-    operator_ids = []
-    async for operator in db.users.find({
-        "role": UserRole.OPERATOR,
-        "created_by": ObjectId(current_user.id)
-    }):
-        operator_ids.append(operator["_id"])
-    
-    if not operator_ids:
-        return {
-            "operators_count": 0,
-            "total_applications": 0,
-            "pending_applications": 0,
-            "verified_applications": 0,
-            "approved_applications": 0,
-            "rejected_applications": 0
-        }
-    
-    # Get application statistics
-    total_apps = await db.loan_applications.count_documents({"operator_id": {"$in": operator_ids}})
-    pending_apps = await db.loan_applications.count_documents({
-        "operator_id": {"$in": operator_ids},
-        "status": LoanStatus.PENDING
-    })
-    verified_apps = await db.loan_applications.count_documents({
-        "operator_id": {"$in": operator_ids},
-        "status": LoanStatus.VERIFIED
-    })
-    approved_apps = await db.loan_applications.count_documents({
-        "operator_id": {"$in": operator_ids},
-        "status": LoanStatus.APPROVED
-    })
-    rejected_apps = await db.loan_applications.count_documents({
-        "operator_id": {"$in": operator_ids},
-        "status": LoanStatus.REJECTED
-    })
+    db = get_database()
+    
+    # The operator count and the status breakdown are independent; run them concurrently
+    operators_count, status_groups = await asyncio.gather(
+        db.users.count_documents({
+            "role": UserRole.OPERATOR,
+            "created_by": current_user.id
+        }),
+        db.loan_applications.aggregate([
+            {"$match": {"manager_id": current_user.id}},
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+        ]).to_list(length=None)
+    )
+    status_counts = {doc["_id"]: doc["count"] for doc in status_groups}
     
     return {
-        "operators_count": operator_count,
-        "total_applications": total_apps,
-        "pending_applications": pending_apps,
-        "verified_applications": verified_apps,
-        "approved_applications": approved_apps,
-        "rejected_applications": rejected_apps
+        "operators_count": operators_count,
+        "total_applications": sum(status_counts.values()),
+        "pending_applications": status_counts.get(LoanStatus.PENDING.value, 0),
+        "verified_applications": status_counts.get(LoanStatus.VERIFIED.value, 0),
+        "approved_applications": status_counts.get(LoanStatus.APPROVED.value, 0),
+        "rejected_applications": status_counts.get(LoanStatus.REJECTED.value, 0)
     }
 
-@router.get("/reports/operator-performance", response_model=List[dict])
+@router.get("/reports/operator-performance", response_model=None)
 async def get_operator_performance_report(
     current_user: User = Depends(require_manager)
 ):
-    db = await get_database()
+    db = get_database()
+    
+    # Fetch this manager's operators and every operator's application statistics
+    # (one grouped pass) concurrently
+    operators, operator_stats = await asyncio.gather(
+        db.users.find({
+            "role": UserRole.OPERATOR,
+            "created_by": current_user.id
+        }, {"name": 1, "email": 1}).to_list(length=None),
+        db.loan_applications.aggregate([
+            {"$match": {"manager_id": current_user.id}},
+            {
+                "$group": {
+                    "_id": "$operator_id",
+                    "total": {"$sum": 1},
+                    "approved": {"$sum": {"$cond": [{"$eq": ["$status", LoanStatus.APPROVED.value]}, 1, 0]}},
+                    "rejected": {"$sum": {"$cond": [{"$eq": ["$status", LoanStatus.REJECTED.value]}, 1, 0]}},
+                    "pending": {"$sum": {"$cond": [
+                        {"$in": ["$status", [LoanStatus.PENDING.value, LoanStatus.VERIFIED.value]]}, 1, 0
+                    ]}}
+                }
+            }
+        ]).to_list(length=None)
+    )
+    stats = {doc["_id"]: doc for doc in operator_stats}
     
-    # Get all operators created by this manager
-    operators = []
-    async for operator in db.users.find({
-        "role": UserRole.OPERATOR,
-        "created_by": ObjectId(current_user.id)
-    }):
-        operator_dict = serialize_user_document(operator)
-        
-        # Get application statistics for this operator
-        total_apps = await db.loan_applications.count_documents({"operator_id": ObjectId(operator["_id"])})
-        approved_apps = await db.loan_applications.count_documents({
-            "operator_id": ObjectId(operator["_id"]),
-            "status": LoanStatus.APPROVED
-        })
-        rejected_apps = await db.loan_applications.count_documents({
-            "operator_id": ObjectId(operator["_id"]),
-            "status": LoanStatus.REJECTED
-        })
-        pending_apps = await db.loan_applications.count_documents({
-            "operator_id": ObjectId(operator["_id"]),
-            "status": {"$in": [LoanStatus.PENDING, LoanStatus.VERIFIED]}
-        })
+    report = []
+    for operator in operators:
+        operator_stats = stats.get(operator["_id"], {})
+        total_apps = operator_stats.get("total", 0)
+        approved_apps = operator_stats.get("approved", 0)
         
         approval_rate = round((approved_apps / total_apps) * 100) if total_apps > 0 else 0
         
-        operator_performance = {
+        report.append({
             "operator_name": operator["name"],
             "operator_email": operator["email"],
             "total_applications": total_apps,
             "approved_applications": approved_apps,
-            "rejected_applications": rejected_apps,
-            "pending_applications": pending_apps,
+            "rejected_applications": operator_stats.get("rejected", 0),
+            "pending_applications": operator_stats.get("pending", 0),
             "approval_rate": approval_rate
-        }
-        operators.append(operator_performance)
+        })
     
-    return operators
+    return json_response(report)
 
-@router.get("/reports/monthly-analytics", response_model=List[dict])
+@router.get("/reports/monthly-analytics", response_model=None)
 async def get_monthly_analytics(
     months: int = 6,
     current_user: User = Depends(require_manager)
 ):
-    db = await get_database()
-    
-    # Get all operator IDs for this manager
-    operator_ids = []
-    async for operator in db.users.find({
-        "role": UserRole.OPERATOR,
-        "created_by": ObjectId(current_user.id)
-    }):
-        operator_ids.append(operator["_id"])
+    db = get_database()
     
-    if not operator_ids:
-        return []
-    
-    # Build aggregation pipeline for monthly data
-    from datetime import datetime, timedelta
-    
-    # Get data for last N months
+    # Window starts on the first day of the month `months - 1` calendar months back,
+    # so buckets line up with whole months instead of drifting 30-day spans
     end_date = datetime.utcnow()
-    start_date = end_date - timedelta(days=months * 30)
+    start_date = month_start(end_date, months - 1)
     
     pipeline = [
         {
             "$match": {
-                "operator_id": {"$in": operator_ids},
+                "manager_id": current_user.id,
                 "created_at": {"$gte": start_date, "$lte": end_date}
             }
         },
         {
             "$group": {
-                "_id": {
-                    "year": {"$year": "$created_at"},
-                    "month": {"$month": "$created_at"}
-                },
+                "_id": {"$dateTrunc": {"date": "$created_at", "unit": "month"}},
                 "total_amount": {"$sum": "$loan_amount"},
                 "applications_count": {"$sum": 1},
                 "approved_amount": {
@@ -482,19 +499,18 @@ async def get_monthly_analytics(
             }
         },
         {
-            "$sort": {"_id.year": 1, "_id.month": 1}
+            "$sort": {"_id": 1}
         }
     ]
     
     monthly_data = []
     async for doc in db.loan_applications.aggregate(pipeline):
-        month_name = datetime(doc["_id"]["year"], doc["_id"]["month"], 1).strftime("%b %Y")
         monthly_data.append({
-            "month": month_name,
+            "month": doc["_id"].strftime("%b %Y"),
             "total_amount": doc["total_amount"],
             "applications_count": doc["applications_count"],
             "approved_amount": doc["approved_amount"],
             "approved_count": doc["approved_count"]
         })
     
-    return monthly_data
\ No newline at end of file
+    return json_response(monthly_data)
\ No newline at end of file
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Header
+from typing import Optional
 from bson import ObjectId
 from datetime import datetime
+import logging
 import uuid
 
 from ..common.models import (
@@ -11,7 +12,9 @@ from ..common.models import (
 )
 from ..common.auth import get_current_active_user
 from ..common.database import get_database
-from ..common.serializers import serialize_objectid
+from ..common.serializers import serialize_objectid, json_response, stream_documents
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -28,10 +31,10 @@ async def create_applicant(
     applicant: ApplicantCreate,
     current_user: User = Depends(require_operator)
 ):
-    db = await get_database()
+    db = get_database()
     
     # Check if applicant with same Aadhar already exists
-    existing = await db.applicants.find_one({"aadhar_number": applicant.aadhar_number})
+    existing = await db.applicants.find_one({"aadhar_number": applicant.aadhar_number}, {"_id": 1})
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -43,22 +46,20 @@ async def create_applicant(
     
     return {"id": str(result.inserted_id), "message": "Applicant created successfully"}
 
-@router.get("/applicants", response_model=List[dict])
+@router.get("/applicants", response_model=None)
 async def get_applicants(
     current_user: User = Depends(require_operator)
 ):
-    db = await get_database()
-    applicants = []
-    async for applicant in db.applicants.find():
-        applicants.append(serialize_objectid(applicant))
-    return applicants
+    db = get_database()
+    applicants = await db.applicants.find().to_list(length=None)
+    return json_response(applicants)
 
 @router.get("/applicants/{applicant_id}", response_model=dict)
 async def get_applicant(
     applicant_id: str,
     current_user: User = Depends(require_operator)
 ):
-    db = await get_database()
+    db = get_database()
     
     applicant = await db.applicants.find_one({"_id": ObjectId(applicant_id)})
     if not applicant:
@@ -74,32 +75,30 @@ async def create_animal(
     animal: AnimalCreate,
     current_user: User = Depends(require_operator)
 ):
-    db = await get_database()
+    db = get_database()
     
     animal_dict = animal.model_dump()
     result = await db.animals.insert_one(animal_dict)
     
     return {"id": str(result.inserted_id), "message": "Animal details saved successfully"}
 
-@router.get("/animals", response_model=List[dict])
+@router.get("/animals", response_model=None)
 async def get_animals(
     current_user: User = Depends(require_operator)
 ):
-    db = await get_database()
-    animals = []
-    async for animal in db.animals.find():
-        animals.append(serialize_objectid(animal))
-    return animals
+    db = get_database()
+    animals = await db.animals.find().to_list(length=None)
+    return json_response(animals)
 
 @router.post("/loan-applications", response_model=dict)
 async def create_loan_application(
     loan_app: LoanApplicationCreate,
     current_user: User = Depends(require_operator)
 ):
-    db = await get_database()
+    db = get_database()
     
     # Verify applicant exists
-    applicant = await db.applicants.find_one({"_id": ObjectId(loan_app.applicant_id)})
+    applicant = await db.applicants.find_one({"_id": ObjectId(loan_app.applicant_id)}, {"_id": 1})
     if not applicant:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -107,7 +106,7 @@ async def create_loan_application(
         )
     
     # Verify animal exists
-    animal = await db.animals.find_one({"_id": ObjectId(loan_app.animal_id)})
+    animal = await db.animals.find_one({"_id": ObjectId(loan_app.animal_id)}, {"_id": 1})
     if not animal:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -119,8 +118,11 @@ async def create_loan_application(
     
     loan_dict = loan_app.model_dump()
     loan_dict["application_number"] = app_number
-    loan_dict["operator_id"] = ObjectId(current_user.id)
+    loan_dict["operator_id"] = current_user.id
+    # Denormalized owning manager so manager views filter without resolving operators
+    loan_dict["manager_id"] = current_user.created_by
     loan_dict["status"] = "pending"  # Explicitly set default status
+    loan_dict["created_at"] = datetime.utcnow()  # Monthly analytics and reports bucket on this
     
     result = await db.loan_applications.insert_one(loan_dict)
     
@@ -130,20 +132,22 @@ async def create_loan_application(
         "message": "Loan application created successfully"
     }
 
-@router.get("/loan-applications", response_model=List[dict])
+@router.get("/loan-applications", response_model=None)
 async def get_loan_applications(
+    accept: Optional[str] = Header(None),
     current_user: User = Depends(require_operator)
 ):
-    db = await get_database()
-    applications = []
+    db = get_database()
     
+    # The list only shows who applied and for which animal; join just those fields
     pipeline = [
-        {"$match": {"operator_id": ObjectId(current_user.id)}},
+        {"$match": {"operator_id": current_user.id}},
         {
             "$lookup": {
                 "from": "applicants",
                 "localField": "applicant_id",
                 "foreignField": "_id",
+                "pipeline": [{"$project": {"name": 1, "phone": 1}}],
                 "as": "applicant"
             }
         },
@@ -152,15 +156,13 @@ async def get_loan_applications(
                 "from": "animals",
                 "localField": "animal_id", 
                 "foreignField": "_id",
+                "pipeline": [{"$project": {"type": 1, "breed": 1}}],
                 "as": "animal"
             }
         }
     ]
     
-    async for app in db.loan_applications.aggregate(pipeline):
-        applications.append(serialize_objectid(app))
-    
-    return applications
+    return await stream_documents(db.loan_applications.aggregate(pipeline), accept)
 
 @router.put("/loan-applications/{app_id}/verify", response_model=dict)
 async def verify_loan_application(
@@ -168,13 +170,13 @@ async def verify_loan_application(
     checklist_data: dict,
     current_user: User = Depends(require_operator)
 ):
-    db = await get_database()
+    db = get_database()
     
     # Verify the application exists and belongs to this operator
     app = await db.loan_applications.find_one({
         "_id": ObjectId(app_id),
-        "operator_id": ObjectId(current_user.id)
-    })
+        "operator_id": current_user.id
+    }, {"_id": 1})
     
     if not app:
         raise HTTPException(
@@ -235,11 +237,12 @@ async def verify_loan_application(
     )
     
     # Update application
+    now = datetime.utcnow()
     update_data = {
         "verification_checklist": checklist.model_dump(),
         "status": LoanStatus.VERIFIED if overall_status else LoanStatus.PENDING,
-        "verified_at": datetime.utcnow() if overall_status else None,
-        "updated_at": datetime.utcnow()
+        "verified_at": now if overall_status else None,
+        "updated_at": now
     }
     
     await db.loan_applications.update_one(
@@ -258,10 +261,10 @@ async def delete_loan_application(
     app_id: str,
     current_user: User = Depends(require_operator)
 ):
-    db = await get_database()
+    db = get_database()
     
     # Check if application exists
-    application = await db.loan_applications.find_one({"_id": ObjectId(app_id)})
+    application = await db.loan_applications.find_one({"_id": ObjectId(app_id)}, {"_id": 1})
     if not application:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -284,7 +287,7 @@ async def get_loan_application_by_id(
     app_id: str,
     current_user: User = Depends(require_operator)
 ):
-    db = await get_database()
+    db = get_database()
     
     # Get application with populated applicant and animal data
     pipeline = [
@@ -338,7 +341,7 @@ async def send_verification_step_email(
 ):
     from ..common.email_service import send_notification_email
     
-    db = await get_database()
+    db = get_database()
     
     # Get application details
     application = await db.loan_applications.find_one({"_id": ObjectId(app_id)})
@@ -395,9 +398,9 @@ async def send_verification_step_email(
         await send_notification_email(applicant["email"], subject, body)
         return {"message": "Verification step email sent successfully"}
         
-    except Exception as e:
+    except Exception:
         # Log error but don't fail the verification process
-        print(f"Failed to send verification email: {e}")
+        logger.exception("Failed to send verification email for application %s", app_id)
         return {"message": "Email sending failed but verification continued"}
 
 @router.put("/loan-applications/{app_id}/complete-verification")
@@ -406,14 +409,15 @@ async def complete_verification(
     verification_data: dict,
     current_user: User = Depends(require_operator)
 ):
-    db = await get_database()
+    db = get_database()
     
     # Update application status to verified
+    now = datetime.utcnow()
     update_data = {
         "status": LoanStatus.VERIFIED,
         "verification_data": verification_data,
-        "verified_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow()
+        "verified_at": now,
+        "updated_at": now
     }
     
     result = await db.loan_applications.update_one(
@@ -435,7 +439,7 @@ async def get_loan_application_by_id(
     current_user: User = Depends(require_operator)
 ):
     """Get a single loan application with all details"""
-    db = await get_database()
+    db = get_database()
     
     try:
         # Get the loan application
@@ -554,16 +558,17 @@ async def complete_verification_process(
     current_user: User = Depends(require_operator)
 ):
     """Complete the multi-step verification process"""
-    db = await get_database()
+    db = get_database()
     
     try:
         # Update application with verification data
+        now = datetime.utcnow()
         update_data = {
             "verification_data": verification_data.get("verification_data", {}),
             "status": LoanStatus.VERIFIED,
-            "verified_at": datetime.utcnow(),
+            "verified_at": now,
             "verified_by": str(current_user.id),
-            "updated_at": datetime.utcnow()
+            "updated_at": now
         }
         
         result = await db.loan_applications.update_one(
@@ -597,7 +602,7 @@ async def get_loan_application_by_id(
     current_user: User = Depends(require_operator)
 ):
     """Get a single loan application with full details"""
-    db = await get_database()
+    db = get_database()
     
     try:
         # Get loan application
@@ -639,7 +644,7 @@ async def send_verification_step_email(
     """Send email notification for verification steps"""
     from ..common.email_service import send_notification_email
     
-    db = await get_database()
+    db = get_database()
     
     try:
         # Get loan application
@@ -689,20 +694,21 @@ async def complete_verification(
     current_user: User = Depends(require_operator)
 ):
     """Complete the multi-step verification process"""
-    db = await get_database()
+    db = get_database()
     
     try:
         # Get loan application
-        app = await db.loan_applications.find_one({"_id": ObjectId(app_id)})
+        app = await db.loan_applications.find_one({"_id": ObjectId(app_id)}, {"_id": 1})
         if not app:
             raise HTTPException(status_code=404, detail="Loan application not found")
         
         # Update application with verification data
+        now = datetime.utcnow()
         update_data = {
             "multi_step_verification": verification_data.get("verification_data", {}),
             "status": LoanStatus.VERIFIED,
-            "verified_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow(),
+            "verified_at": now,
+            "updated_at": now,
             "all_steps_completed": verification_data.get("all_steps_completed", True)
         }
         
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+import asyncio
+import os
+import sys
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+load_dotenv()
+
+# One-off migration: stamp manager_id (the operator's creator) on loan applications
+# created before it was denormalized. Safe to re-run; only documents missing the field are touched.
+# Needs MongoDB 5.0+ ($merge into the same collection, $first).
+
+async def backfill_manager_ids() -> bool:
+    # Database connection; no defaults, so the migration never writes to an unintended cluster
+    MONGODB_URL = os.getenv("MONGODB_URL")
+    DB_NAME = os.getenv("DB_NAME")
+    if not MONGODB_URL or not DB_NAME:
+        print("Error: MONGODB_URL and DB_NAME must be set (environment or .env)")
+        return False
+    
+    client = AsyncIOMotorClient(MONGODB_URL)
+    db = client[DB_NAME]
+    
+    try:
+        missing = {"manager_id": {"$exists": False}}
+        before = await db.loan_applications.count_documents(missing)
+        print(f"Loan applications without manager_id: {before}")
+        if not before:
+            return True
+        
+        await db.loan_applications.aggregate([
+            {"$match": missing},
+            {
+                "$lookup": {
+                    "from": "users",
+                    "localField": "operator_id",
+                    "foreignField": "_id",
+                    "as": "operator"
+                }
+            },
+            {"$project": {"manager_id": {"$first": "$operator.created_by"}}},
+            {"$match": {"manager_id": {"$ne": None}}},
+            {"$merge": {"into": "loan_applications", "on": "_id", "whenMatched": "merge", "whenNotMatched": "discard"}}
+        ]).to_list(length=None)
+        
+        after = await db.loan_applications.count_documents(missing)
+        print(f"Backfilled {before - after} loan applications")
+        if after:
+            # Orphaned applications whose operator no longer exists cannot be attributed
+            print(f"Warning: {after} loan applications still have no manager_id (operator missing)")
+        return True
+        
+    except Exception as e:
+        print(f"Error backfilling manager ids: {e}")
+        return False
+    finally:
+        client.close()
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(backfill_manager_ids()) else 1)
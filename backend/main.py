@@ -1,13 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 import uvicorn
 from dotenv import load_dotenv
 import os
+import queue
+import logging
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
-from app.common.database import init_database
+from app.common.database import init_database, close_database
 from app.common.auth_routes import router as auth_router
 from app.operator.routes import router as operator_router
 from app.manager.routes import router as manager_router
@@ -15,18 +19,36 @@ from app.admin.routes import router as admin_router
 
 load_dotenv()
 
+def setup_logging() -> QueueListener:
+    """Route app.* loggers through a queue so request handlers never block on log I/O"""
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+    app_logger.handlers = [QueueHandler(log_queue)]
+    app_logger.propagate = False
+    
+    return QueueListener(log_queue, handler, respect_handler_level=True)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    log_listener = setup_logging()
+    log_listener.start()
     # Initialize database connection
     await init_database()
     yield
     # Cleanup
+    await close_database()
+    log_listener.stop()
 
 app = FastAPI(
     title="Livestock Loan Eligibility System",
     description="A comprehensive system for managing domestic animal loan applications",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware